@@ -6,6 +6,7 @@ import types
 import ast
 import json
 import shutil
+import functools
 from keyword import iskeyword
 from textwrap import TextWrapper
 from jello.dotmap import DotMap
@@ -23,20 +24,73 @@ try:
 except Exception:
     PYGMENTS_INSTALLED = False
 
-
+# make orjson import optional. It is only used to speed up loading JSON
+try:
+    import orjson
+    ORJSON_INSTALLED = True
+except Exception:
+    ORJSON_INSTALLED = False
+
+# lexers are stateless, so a single shared instance of each can be reused
+if PYGMENTS_INSTALLED:
+    _JSON_LEXER = JsonLexer()
+    _JS_LEXER = JavascriptLexer()
+
+
+# dict attribute names that shadow keys in dot notation, so these keys need bracket notation
+_DICT_METHODS = frozenset({
+    '__class__', '__class_getitem__', '__contains__', '__delattr__',
+    '__delitem__', '__dir__', '__eq__', '__format__', '__ge__',
+    '__getattribute__', '__getitem__', '__getstate__', '__gt__',
+    '__init__', '__init_subclass__', '__ior__', '__iter__', '__le__',
+    '__len__', '__lt__', '__ne__', '__new__', '__or__', '__reduce__',
+    '__reduce_ex__', '__repr__', '__reversed__', '__ror__', '__setattr__',
+    '__setitem__', '__sizeof__', '__str__', '__subclasshook__', 'clear',
+    'copy', 'fromkeys', 'get', 'items', 'keys', 'pop', 'popitem',
+    'setdefault', 'update', 'values'
+})
+
+
+# key names repeat heavily across records, so cache the result for the schema walker
+@functools.lru_cache(maxsize=4096)
 def is_valid_variable_name(name: str) -> bool:
-    dict_methods = [
-        '__class__', '__class_getitem__', '__contains__', '__delattr__',
-        '__delitem__', '__dir__', '__eq__', '__format__', '__ge__',
-        '__getattribute__', '__getitem__', '__getstate__', '__gt__',
-        '__init__', '__init_subclass__', '__ior__', '__iter__', '__le__',
-        '__len__', '__lt__', '__ne__', '__new__', '__or__', '__reduce__',
-        '__reduce_ex__', '__repr__', '__reversed__', '__ror__', '__setattr__',
-        '__setitem__', '__sizeof__', '__str__', '__subclasshook__', 'clear',
-        'copy', 'fromkeys', 'get', 'items', 'keys', 'pop', 'popitem',
-        'setdefault', 'update', 'values'
-    ]
-    return name.isidentifier() and not iskeyword(name) and name not in dict_methods
+    return name.isidentifier() and not iskeyword(name) and name not in _DICT_METHODS
+
+
+_VALID_ENV_COLORS = frozenset({
+    'black', 'red', 'green', 'yellow', 'blue', 'magenta', 'cyan', 'gray', 'brightblack', 'brightred',
+    'brightgreen', 'brightyellow', 'brightblue', 'brightmagenta', 'brightcyan', 'white', 'default'
+})
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_env_colors(env_colors):
+    """
+    Parses the JELLO_COLORS environment variable string.
+
+    Returns a tuple of (color_list, input_error) where color_list is a tuple of 4 color names.
+    """
+    if not env_colors:
+        return ('default', 'default', 'default', 'default'), False
+
+    color_list = tuple(env_colors.split(','))
+    input_error = len(color_list) != 4 or any(color not in _VALID_ENV_COLORS for color in color_list)
+
+    return color_list, input_error
+
+
+# node kinds used by the schema walker keyed by exact type. Other types (e.g. dict or list
+# subclasses) fall back to isinstance() checks
+_LIST, _DICT, _LEAF = range(3)
+_NODE_KINDS = {
+    list: _LIST, dict: _DICT, str: _LEAF, int: _LEAF, float: _LEAF, bool: _LEAF, type(None): _LEAF
+}
+
+# schema type annotations are aligned to column 76, so reuse the padding strings
+_PADS = tuple(' ' * i for i in range(77))
+
+# JSON representation of the singleton scalars
+_SCALAR_REPR = {True: 'true', False: 'false', None: 'null'}
 
 
 class opts:
@@ -67,6 +121,37 @@ class JelloTheme:
             String: 'ansigreen'
         }
 
+    # style and formatters are built lazily and cached until the theme changes
+    _theme_key = None
+    _style_cls = None
+    _formatter = None
+    _html_formatter = None
+
+    def _get_style(self):
+        """Returns the JelloStyle class for the current theme, rebuilding it only if the theme changed."""
+        theme_key = tuple(self.theme.items())
+        if theme_key != self._theme_key:
+            self._style_cls = type('JelloStyle', (Style,), {'styles': self.theme})
+            self._formatter = None
+            self._html_formatter = None
+            self._theme_key = theme_key
+
+        return self._style_cls
+
+    def _get_formatter(self):
+        style = self._get_style()
+        if self._formatter is None:
+            self._formatter = Terminal256Formatter(style=style)
+
+        return self._formatter
+
+    def _get_html_formatter(self):
+        style = self._get_style()
+        if self._html_formatter is None:
+            self._html_formatter = HtmlFormatter(style=style, noclasses=True)
+
+        return self._html_formatter
+
     def set_colors(self):
         """
         Updates the JelloTheme.theme dictionary used by the JelloStyle class.
@@ -87,27 +172,12 @@ class JelloTheme:
             or
             JELLO_COLORS=default,default,default,default
         """
-        env_colors = os.getenv('JELLO_COLORS')
-        input_error = False
-
-        if env_colors:
-            color_list = env_colors.split(',')
-
-        if env_colors and len(color_list) != 4:
-            input_error = True
-
-        if env_colors:
-            for color in color_list:
-                if color not in ['black', 'red', 'green', 'yellow', 'blue', 'magenta', 'cyan', 'gray', 'brightblack', 'brightred',
-                                 'brightgreen', 'brightyellow', 'brightblue', 'brightmagenta', 'brightcyan', 'white', 'default']:
-                    input_error = True
-        else:
-            color_list = ['default', 'default', 'default', 'default']
+        color_list, input_error = _parse_env_colors(os.getenv('JELLO_COLORS'))
 
         # if there is an issue with the env variable, just set all colors to default and move on
         if input_error:
             warning_message(['could not parse JELLO_COLORS environment variable'])
-            color_list = ['default', 'default', 'default', 'default']
+            color_list = ('default', 'default', 'default', 'default')
 
         if PYGMENTS_INSTALLED:
             # first set theme from opts class or fallback to defaults
@@ -130,135 +200,90 @@ class JelloTheme:
 class Schema(JelloTheme):
     """Inherits theme and set_colors() from JelloTheme"""
 
-    def __init__(self):
-        self._schema_list = []
-
     def color_output(self, data):
         if not opts.mono and PYGMENTS_INSTALLED:
-            class JelloStyle(Style):
-                styles = self.theme
-
-            lexer = JavascriptLexer()
-            formatter = Terminal256Formatter(style=JelloStyle)
-            return highlight(data, lexer, formatter)[0:-1]
+            return highlight(data, _JS_LEXER, self._get_formatter())[0:-1]
 
         else:
             return data
 
     def html_output(self, data):
-        class JelloStyle(Style):
-            styles = self.theme
-
-        lexer = JavascriptLexer()
-        formatter = HtmlFormatter(style=JelloStyle, noclasses=True)
-        return highlight(data, lexer, formatter)
+        return highlight(data, _JS_LEXER, self._get_html_formatter())
 
     def create_schema(self, data):
-        self._schema_gen(data)
-        myschema = '\n'.join(self._schema_list)
-        # unsure if this is helpful, but trying to reduce memory footprint by clearing the list
-        self._schema_list *= 0
-        return myschema
+        schema_list = []
+        self._schema_gen(data, schema_list.append)
+        return '\n'.join(schema_list)
 
-    def _schema_gen(self, src, path='_'):
+    def _schema_gen(self, src, append, path='_'):
         """
         Creates a grep-able schema representation of the JSON.
-        This method is recursive, and output is stored within self._schema_list (list).
+        The tree is walked iteratively with an explicit stack, and each output line is passed
+        to append().
         """
-        if isinstance(src, list):
-            # print empty brackets as first list definition
-            val = '[]'
-            val_type = ''
-            padding = ''
-            if opts.types:
+        json_dumps = json.dumps
+        isinstance_ = isinstance
+        node_kinds = _NODE_KINDS
+        show_types = bool(opts.types)
+        stack = [(src, path)]
+
+        while stack:
+            node, path = stack.pop()
+            kind = node_kinds.get(type(node))
+            if kind is None:
+                kind = _LIST if isinstance_(node, list) else _DICT if isinstance_(node, dict) else _LEAF
+
+            if kind == _LIST:
+                # print empty brackets as first list definition
+                val = '[]'
                 val_type = '//   (array)'
-                padding = '  '
-                if len(path) + len(val) + len(val_type) < 76:
-                    padding = ' ' * (76 - (len(path) + len(val) + len(val_type)))
-
-            self._schema_list.append(f'{path} = {val};{padding}{val_type}')
 
-            for i, item in enumerate(src):
-                self._schema_gen(item, path=f'{path}[{i}]')
+                # push children in reverse so they are popped in their original order
+                for i in range(len(node) - 1, -1, -1):
+                    stack.append((node[i], f'{path}[{i}]'))
 
-        elif isinstance(src, dict):
-            # print empty curly brackets as first object definition
-            val = '{}'
-            val_type = ''
-            padding = ''
-            if opts.types:
+            elif kind == _DICT:
+                # print empty curly brackets as first object definition
+                val = '{}'
                 val_type = '//  (object)'
-                padding = '  '
-                if len(path) + len(val) + len(val_type) < 76:
-                    padding = ' ' * (76 - (len(path) + len(val) + len(val_type)))
 
-            self._schema_list.append(f'{path} = {val};{padding}{val_type}')
+                children = []
+                for k, v in node.items():
+                    # encapsulate key in brackets if it is not a valid variable name
+                    if is_valid_variable_name(k):
+                        children.append((v, f'{path}.{k}'))
+                    else:
+                        children.append((v, f'{path}["{k}"]'))
 
-            for k, v in src.items():
-                # encapsulate key in brackets if it is not a valid variable name
-                if is_valid_variable_name(k):
-                    k = f'.{k}'
-                else:
-                    k = f'["{k}"]'
-
-                if isinstance(v, list):
-                    # print empty brackets as first list definition
-                    val = '[]'
-                    val_type = ''
-                    padding = ''
-                    if opts.types:
-                        val_type = '//   (array)'
-                        padding = '  '
-                        if len(path) + len(val) + len(val_type) < 76:
-                            padding = ' ' * (76 - (len(f'{path}{k}') + len(val) + len(val_type)))
-
-                    self._schema_list.append(f'{path}{k} = {val};{padding}{val_type}')
-
-                    for i, item in enumerate(v):
-                        self._schema_gen(item, path=f'{path}{k}[{i}]')
-
-                elif isinstance(v, dict):
-                    self._schema_gen(v, path=f'{path}{k}')
+                children.reverse()
+                stack.extend(children)
 
+            else:
+                # format the common scalars directly instead of calling json.dumps()
+                if node is True or node is False or node is None:
+                    val = _SCALAR_REPR[node]
+                elif type(node) is int:
+                    val = str(node)
                 else:
-                    val = json.dumps(v, ensure_ascii=False)
-                    val_type = ''
-                    padding = ''
-                    if opts.types:
-                        if val == 'true' or val == 'false':
-                            val_type = '// (boolean)'
-                        elif val == 'null':
-                            val_type = '//    (null)'
-                        elif val.replace('.', '', 1).isdigit():
-                            val_type = '//  (number)'
-                        else:
-                            val_type = '//  (string)'
-
-                        padding = '  '
-                        if len(path) + len(k) + len(val) + len(val_type) < 76:
-                            padding = ' ' * (76 - (len(path) + len(k) + len(val) + len(val_type)))
-
-                    self._schema_list.append(f'{path}{k} = {val};{padding}{val_type}')
+                    val = json_dumps(node, ensure_ascii=False)
 
-        else:
-            val = json.dumps(src, ensure_ascii=False)
-            val_type = ''
-            padding = ''
-            if opts.types:
-                if val == 'true' or val == 'false':
+                if not show_types:
+                    val_type = ''
+                elif node is True or node is False:
                     val_type = '// (boolean)'
-                elif val == 'null':
+                elif node is None:
                     val_type = '//    (null)'
-                elif val.replace('.', '', 1).isdigit():
+                elif isinstance_(node, (int, float)):
                     val_type = '//  (number)'
                 else:
                     val_type = '//  (string)'
 
-                padding = '  '
-                if len(path) + len(val) + len(val_type) < 76:
-                    padding = ' ' * (76 - (len(path) + len(val) + len(val_type)))
-
-            self._schema_list.append(f'{path} = {val};{padding}{val_type}')
+            if show_types:
+                total = len(path) + len(val) + len(val_type)
+                padding = _PADS[76 - total] if total < 76 else '  '
+                append(f'{path} = {val};{padding}{val_type}')
+            else:
+                append(f'{path} = {val};')
 
 
 class Json(JelloTheme):
@@ -266,23 +291,13 @@ class Json(JelloTheme):
 
     def color_output(self, data):
         if not opts.mono and PYGMENTS_INSTALLED:
-            class JelloStyle(Style):
-                styles = self.theme
-
-            lexer = JsonLexer()
-            formatter = Terminal256Formatter(style=JelloStyle)
-            return highlight(data, lexer, formatter)[0:-1]
+            return highlight(data, _JSON_LEXER, self._get_formatter())[0:-1]
 
         else:
             return data
 
     def html_output(self, data):
-        class JelloStyle(Style):
-            styles = self.theme
-
-        lexer = JsonLexer()
-        formatter = HtmlFormatter(style=JelloStyle, noclasses=True)
-        return highlight(data, lexer, formatter)
+        return highlight(data, _JSON_LEXER, self._get_html_formatter())
 
     def create_json(self, data):
         separators = None
@@ -301,26 +316,33 @@ class Json(JelloTheme):
 
             # print lines
             else:
-                flat_list = ''
+                nulls = opts.nulls
+                raw = opts.raw
+                flat_list = []
+                append = flat_list.append
+
                 for entry in data:
                     if entry is None:
-                        if opts.nulls:
-                            flat_list += 'null\n'
-                        else:
-                            flat_list += '\n'
+                        append('null' if nulls else '')
+
+                    # format booleans and plain ints directly instead of calling json.dumps()
+                    elif entry is True or entry is False:
+                        append(_SCALAR_REPR[entry])
+
+                    elif type(entry) is int:
+                        append(str(entry))
 
                     elif isinstance(entry, (dict, list, bool, int, float)):
-                        flat_list += json.dumps(entry, separators=separators, ensure_ascii=False) + '\n'
+                        append(json.dumps(entry, separators=separators, ensure_ascii=False))
 
                     elif isinstance(entry, str):
                         # replace \n with \\n here so lines with newlines literally print the \n char
+                        # (str.replace is much faster than str.translate for this one-to-two char mapping)
                         entry = entry.replace('\n', '\\n')
-                        if opts.raw:
-                            flat_list += f'{entry}' + '\n'
-                        else:
-                            flat_list += f'"{entry}"' + '\n'
+                        append(entry if raw else f'"{entry}"')
 
-                return flat_list.rstrip()
+                # rstrip() keeps trailing blank lines (e.g. from unprinted nulls) out of the output
+                return '\n'.join(flat_list).rstrip()
 
         # naked single item return case
         elif data is None:
@@ -347,13 +369,27 @@ class Json(JelloTheme):
             raise TypeError(f'Object is not JSON serializable')
 
 
+def _json_loads(data):
+    """
+    Loads a JSON string with orjson if it is installed. Falls back to json.loads() for
+    input orjson rejects (e.g. NaN or integers larger than 64 bits) and for its error messages.
+    """
+    if ORJSON_INSTALLED:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+
+    return json.loads(data)
+
+
 def load_json(data):
     try:
-        json_dict = json.loads(data)
+        json_dict = _json_loads(data)
     except Exception as e:
         try:
             # if json.loads fails, try loading as json lines
-            json_dict = [json.loads(i) for i in data.splitlines() if i.strip()]
+            json_dict = [_json_loads(i) for i in data.splitlines() if i.strip()]
         except Exception:
             # raise original JSON exception instead of JSON Lines exception
             raise e
@@ -396,13 +432,67 @@ def read_file(file_path):
     with open(file_path, 'r') as f:
         return f.read()
 
+@functools.lru_cache(maxsize=8)
+def _compile_conf(jelloconf, conf_file):
+    """
+    Compiles the initialization file source. Results are cached on the file contents
+    so an unchanged file is not re-parsed and recompiled on every query.
+    """
+    return compile(jelloconf, conf_file, 'exec')
+
+# builtins and helpers that can reach attributes without an ast.Attribute node in the query
+_ATTRIBUTE_NAMES = frozenset({
+    'getattr', 'hasattr', 'setattr', 'delattr', 'attrgetter', 'vars', 'dir', 'eval', 'exec', 'compile'
+})
+
+def _uses_attributes(tree):
+    """
+    Returns True if the query may use dot notation on the data. This is conservative: any
+    attribute access (including on loop variables), attribute helper names, or imports (whose
+    functions may use dot notation) count.
+    """
+    return any(isinstance(node, (ast.Attribute, ast.Import, ast.ImportFrom)) or
+               (isinstance(node, ast.Name) and node.id in _ATTRIBUTE_NAMES)
+               for node in ast.walk(tree))
+
+@functools.lru_cache(maxsize=128)
+def _compile_query(query):
+    """
+    Compiles the query into a (block_code, last_code, uses_attributes) tuple, where last_code
+    evaluates the final expression and uses_attributes is True if the query uses dot notation.
+    block_code is None if the query is a single expression. Cached so the same query run against
+    many inputs is only compiled once.
+    """
+    # most queries are a single expression, which can be compiled directly in eval mode
+    try:
+        expr = ast.parse(query, mode='eval')
+        return None, compile(expr, '<string>', mode='eval'), _uses_attributes(expr)
+    except SyntaxError:
+        pass
+
+    block = ast.parse(query, mode='exec')
+
+    if len(block.body) < 1:
+        raise ValueError('No query found.')
+
+    uses_attributes = _uses_attributes(block)
+    last = ast.Expression(block.body.pop().value)    # assumes last node is an expression
+    return compile(block, '<string>', mode='exec'), compile(last, '<string>', mode='eval'), uses_attributes
+
 def pyquery(data, query):
     """Sets options and runs the user's query."""
     output = None
+    block_code, last_code, uses_attributes = _compile_query(query)
 
     # read data into '_' variable
+    # DotMap is only needed for dot notation, which the initialization file may also use
+    dotmap_input = bool(uses_attributes or opts.initialize)
+
+    if not dotmap_input:
+        _ = data
+
     # if data is a list of dictionaries, then need to iterate through and convert all dictionaries to DotMap
-    if isinstance(data, list):
+    elif isinstance(data, list):
         _ = [DotMap(i, _dynamic=False, _prevent_method_masking=True) if isinstance(i, dict)
              else i for i in data]
 
@@ -413,13 +503,10 @@ def pyquery(data, query):
         _ = data
 
     # read initialization file to set colors, options, and user-defined functions
-    jelloconf = ''
     conf_file = ''
     jcnf_dict = {}
 
     if opts.initialize:
-        pyquery._ = _  # allows the data to be available to the initialization file
-
         if sys.platform.startswith('win32'):
             conf_file_dir = os.environ['APPDATA']
         else:
@@ -427,16 +514,12 @@ def pyquery(data, query):
 
         try:
             conf_file = os.path.join(conf_file_dir, '.jelloconf.py')
-            jelloconf = read_file(conf_file)
-
-            # inject the data into the initialization module
-            conf_prepend = 'from jello.lib import pyquery as __q__\n'
-            conf_prepend += '_ = __q__._\n'
-            jelloconf = conf_prepend + jelloconf
+            jelloconf_code = _compile_conf(read_file(conf_file), conf_file)
 
-            # create and import the modified .jelloconf file as a normal module
+            # create and import the .jelloconf file as a normal module with the data available as '_'
             jcnf = types.ModuleType('jcnf')
-            exec(jelloconf, jcnf.__dict__)
+            jcnf.__dict__['_'] = _
+            exec(jelloconf_code, jcnf.__dict__)
             jcnf_dict = {f: getattr(jcnf, f) for f in dir(jcnf) if not f.startswith('__')}
 
         except FileNotFoundError:
@@ -477,21 +560,18 @@ def pyquery(data, query):
     scope.update(jcnf_dict)
 
     # run the query
-    block = ast.parse(query, mode='exec')
+    if block_code is not None:
+        exec(block_code, scope)
 
-    if len(block.body) < 1:
-        raise ValueError('No query found.')
-
-    last = ast.Expression(block.body.pop().value)    # assumes last node is an expression
-    exec(compile(block, '<string>', mode='exec'), scope)
-    output = eval(compile(last, '<string>', mode='eval'), scope)
+    output = eval(last_code, scope)
 
-    # convert output back to normal dict
-    if isinstance(output, list):
-        output = [i.toDict() if isinstance(i, DotMap) else i for i in output]
+    # convert output back to normal dict. Only needed if the input was converted to DotMap
+    if dotmap_input:
+        if isinstance(output, list):
+            output = [i.toDict() if isinstance(i, DotMap) else i for i in output]
 
-    elif isinstance(output, DotMap):
-        output = output.toDict()
+        elif isinstance(output, DotMap):
+            output = output.toDict()
 
     # if DotMap returns a bound function then we know it was a reserved attribute name
     if hasattr(output, '__self__'):
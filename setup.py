@@ -12,6 +12,9 @@ setuptools.setup(
     install_requires=[
         'Pygments>=2.4.2'
     ],
+    extras_require={
+        'fast': ['orjson']
+    },
     license='MIT',
     long_description=long_description,
     long_description_content_type='text/markdown',
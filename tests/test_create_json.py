@@ -3,6 +3,7 @@
 import unittest
 from collections import OrderedDict
 import pygments
+from pygments.token import Number
 from jello.lib import opts, Json
 
 
@@ -461,6 +462,26 @@ class MyTests(unittest.TestCase):
         output = self.json_out.create_json(data_in)
         self.assertEqual(self.json_out.color_output(output), expected)
 
+    def test_dict_color_theme_change(self):
+        """
+        Test color output is rebuilt after the theme changes
+        """
+        data_in = {'int': 42}
+        output = self.json_out.create_json(data_in)
+        self.assertEqual(self.json_out.color_output(output), '{\n  \x1b[34;01m"int"\x1b[39;00m: \x1b[35m42\x1b[39m\n}')
+        self.json_out.theme = dict(self.json_out.theme)
+        self.json_out.theme[Number] = 'ansired'
+        self.assertEqual(self.json_out.color_output(output), '{\n  \x1b[34;01m"int"\x1b[39;00m: \x1b[31m42\x1b[39m\n}')
+
+    def test_dict_color_m(self):
+        """
+        Test color output is skipped when -m is set after Json is created
+        """
+        data_in = {'int': 42}
+        output = self.json_out.create_json(data_in)
+        opts.mono = True
+        self.assertEqual(self.json_out.color_output(output), output)
+
     #
     # true in a list
     #
@@ -1245,6 +1266,24 @@ class MyTests(unittest.TestCase):
         opts.lines = True
         self.assertEqual(self.json_out.create_json(data_in), expected)
 
+    def test_list_equal_scalars_l(self):
+        """
+        Test [True, 1, 1.0, 0.0, -0.0, True, 1] -l
+        """
+        data_in = [True, 1, 1.0, 0.0, -0.0, True, 1]
+        expected = 'true\n1\n1.0\n0.0\n-0.0\ntrue\n1'
+        opts.lines = True
+        self.assertEqual(self.json_out.create_json(data_in), expected)
+
+    def test_repeated_string_raw_change(self):
+        """
+        Test the same string with and without -r
+        """
+        data_in = 'string\nwith newline'
+        self.assertEqual(self.json_out.create_json(data_in), '"string\\nwith newline"')
+        opts.raw = True
+        self.assertEqual(self.json_out.create_json(data_in), 'string\\nwith newline')
+
     def test_non_serializable(self):
         """
         Test _.items()
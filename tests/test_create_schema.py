@@ -2,6 +2,8 @@
 
 import unittest
 import os
+import sys
+from collections import OrderedDict
 from jello.lib import opts, Schema
 
 
@@ -544,6 +546,42 @@ class MyTests(unittest.TestCase):
         expected = '_ = [];\n_[0] = [];\n_[0][0] = [];\n_[0][0][0] = [];\n_[0][0][0][0] = {};\n_[0][0][0][0].foo = [];\n_[0][0][0][0].foo[0] = [];\n_[0][0][0][0].foo[0][0] = [];\n_[0][0][0][0].foo[0][0][0] = [];\n_[0][0][0][0].foo[0][0][0][0] = 1;\n_[0][0][0][0].foo[0][0][0][1] = 2;\n_[0][0][0][0].foo[0][0][0][2] = 3;'
         self.assertEqual(self.schema.create_schema(data_in), expected)
 
+    def test_negative_numbers_t(self):
+        """
+        Test negative and exponent numbers are typed as numbers -t
+        """
+        data_in = [-42, -3.14, 1e+100]
+        expected = '_ = [];                                                             //   (array)\n_[0] = -42;                                                         //  (number)\n_[1] = -3.14;                                                       //  (number)\n_[2] = 1e+100;                                                      //  (number)'
+        opts.types = True
+        self.assertEqual(self.schema.create_schema(data_in), expected)
+
+    def test_dict_subclass_m(self):
+        """
+        Test dict subclasses nested in a list are expanded -m
+        """
+        data_in = [OrderedDict(foo=OrderedDict(bar=1))]
+        expected = '_ = [];\n_[0] = {};\n_[0].foo = {};\n_[0].foo.bar = 1;'
+        self.assertEqual(self.schema.create_schema(data_in), expected)
+
+    def test_very_deep_nest_m(self):
+        """
+        Test nesting deeper than the Python recursion limit -m
+        """
+        data_in = []
+        for _ in range(sys.getrecursionlimit() + 100):
+            data_in = [data_in]
+        output = self.schema.create_schema(data_in)
+        self.assertEqual(len(output.splitlines()), sys.getrecursionlimit() + 101)
+
+    def test_long_path_nested_list_t(self):
+        """
+        Test padding of an array nested in an object with a long path -t
+        """
+        data_in = {'a' * 50: {'b' * 11: []}}
+        expected = '_ = {};                                                             //  (object)\n_.aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa = {};          //  (object)\n_.aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa.bbbbbbbbbbb = [];  //   (array)'
+        opts.types = True
+        self.assertEqual(self.schema.create_schema(data_in), expected)
+
     #
     # Handle invalid or reserved key names
     #
@@ -58,5 +58,20 @@ class MyTests(unittest.TestCase):
         self.assertEqual(load_json(self.json_lines_extra_spaces), expected)
 
 
+    def test_load_json_non_standard_values(self):
+        """
+        Test with NaN and an integer larger than 64 bits
+        """
+        result = load_json('{"nan": NaN, "big": 123456789012345678901234567890}')
+        self.assertNotEqual(result['nan'], result['nan'])
+        self.assertEqual(result['big'], 123456789012345678901234567890)
+
+    def test_load_invalid_json(self):
+        """
+        Test with invalid JSON
+        """
+        self.assertRaises(ValueError, load_json, '{"foo": 1,')
+
+
 if __name__ == '__main__':
     unittest.main()
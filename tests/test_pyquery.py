@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
 
 import unittest
+import os
+import sys
+import tempfile
+import traceback
+from unittest import mock
 import jello.cli
 from jello.cli import opts
 
@@ -163,5 +168,144 @@ class MyTests(unittest.TestCase):
         self.assertRaises(ValueError, jello.cli.pyquery, data_in, query)
 
 
+    def test_subscript_query(self):
+        """
+        Test _[1]["array"] on list of dicts (bracket notation only)
+        """
+        data_in = self.list_of_dicts_sample
+        query = '_[1]["array"]'
+        expected = self.list_of_dicts_sample[1]['array']
+        self.assertEqual(jello.cli.pyquery(data_in, query), expected)
+
+    def test_loop_variable_dot_notation(self):
+        """
+        Test [x.int for x in _] on list of dicts
+        """
+        data_in = self.list_of_dicts_sample
+        query = '[x.int for x in _]'
+        self.assertEqual(jello.cli.pyquery(data_in, query), [42, 10001])
+
+    def test_attrgetter_query(self):
+        """
+        Test operator.attrgetter on list of dicts (dot notation without an attribute node)
+        """
+        data_in = [{"a": 1}, {"a": 2}]
+        query = 'from operator import attrgetter\nlist(map(attrgetter("a"), _))'
+        self.assertEqual(jello.cli.pyquery(data_in, query), [1, 2])
+
+    def test_eval_query(self):
+        """
+        Test eval("_.a") (dot notation inside a string)
+        """
+        data_in = {"a": {"b": 1}}
+        query = 'eval("_.a")'
+        self.assertEqual(jello.cli.pyquery(data_in, query), {'b': 1})
+
+    def test_dir_query(self):
+        """
+        Test dir(_) lists the data keys
+        """
+        data_in = {"a": {"b": 1}, "k": 2}
+        query = 'dir(_)'
+        output = jello.cli.pyquery(data_in, query)
+        self.assertIn('a', output)
+        self.assertIn('k', output)
+
+    def test_str_without_dot_notation(self):
+        """
+        Test str(_["a"]) without dot notation shows a plain dict
+        """
+        data_in = {"a": {"b": 1}}
+        self.assertEqual(jello.cli.pyquery(data_in, 'str(_["a"])'), "{'b': 1}")
+        self.assertEqual(jello.cli.pyquery(data_in, 'f"{_[\'a\']}"'), "{'b': 1}")
+
+    def test_str_with_dot_notation(self):
+        """
+        Test str(_.a) with dot notation shows a DotMap
+        """
+        data_in = {"a": {"b": 1}}
+        self.assertEqual(jello.cli.pyquery(data_in, 'str(_.a)'), 'DotMap(b=1)')
+
+    def test_mixed_list_output(self):
+        """
+        Test [_[0].int, _[1]] returns a plain dict after a scalar
+        """
+        data_in = self.list_of_dicts_sample
+        query = '[_[0].int, _[1]]'
+        output = jello.cli.pyquery(data_in, query)
+        self.assertEqual(output, [42, self.list_of_dicts_sample[1]])
+        self.assertIs(type(output[1]), dict)
+
+    def test_query_reused(self):
+        """
+        Test the same multi-statement query against several inputs
+        """
+        query = 'x = _["a"] * 2\nx + 1'
+        self.assertEqual(jello.cli.pyquery({'a': 1}, query), 3)
+        self.assertEqual(jello.cli.pyquery({'a': 20}, query), 41)
+
+    def test_empty_query(self):
+        """
+        Test empty query (ValueError)
+        """
+        data_in = {"foo": "bar"}
+        query = ''
+        self.assertRaises(ValueError, jello.cli.pyquery, data_in, query)
+
+    def test_initialize_file_changed(self):
+        """
+        Test -i picks up changes to .jelloconf.py between queries
+        """
+        env_var = 'APPDATA' if sys.platform.startswith('win32') else 'HOME'
+        opts.initialize = True
+
+        with tempfile.TemporaryDirectory() as conf_dir, mock.patch.dict(os.environ, {env_var: conf_dir}):
+            conf_file = os.path.join(conf_dir, '.jelloconf.py')
+
+            with open(conf_file, 'w') as f:
+                f.write('def plus_one(x):\n    return x + 1\n')
+            self.assertEqual(jello.cli.pyquery(41, 'plus_one(_)'), 42)
+            self.assertEqual(jello.cli.pyquery(1, 'plus_one(_)'), 2)
+
+            with open(conf_file, 'w') as f:
+                f.write('def plus_one(x):\n    return x + 1001\n')
+            self.assertEqual(jello.cli.pyquery(41, 'plus_one(_)'), 1042)
+
+
+    def test_initialize_file_traceback_line(self):
+        """
+        Test -i exceptions report the line number within .jelloconf.py
+        """
+        env_var = 'APPDATA' if sys.platform.startswith('win32') else 'HOME'
+        opts.initialize = True
+
+        with tempfile.TemporaryDirectory() as conf_dir, mock.patch.dict(os.environ, {env_var: conf_dir}):
+            conf_file = os.path.join(conf_dir, '.jelloconf.py')
+
+            with open(conf_file, 'w') as f:
+                f.write('x = 1\ny = 2\n1/0\n')
+
+            try:
+                jello.cli.pyquery(1, '_')
+                self.fail('ZeroDivisionError not raised')
+            except ZeroDivisionError as e:
+                frame = traceback.extract_tb(e.__traceback__)[-1]
+
+            self.assertEqual((frame.filename, frame.lineno, frame.line), (conf_file, 3, '1/0'))
+
+    def test_initialize_file_data(self):
+        """
+        Test -i makes the data available to .jelloconf.py as '_'
+        """
+        env_var = 'APPDATA' if sys.platform.startswith('win32') else 'HOME'
+        opts.initialize = True
+
+        with tempfile.TemporaryDirectory() as conf_dir, mock.patch.dict(os.environ, {env_var: conf_dir}):
+            with open(os.path.join(conf_dir, '.jelloconf.py'), 'w') as f:
+                f.write('first_key = list(_)[0]\n')
+
+            self.assertEqual(jello.cli.pyquery({'foo': 1, 'bar': 2}, 'first_key'), 'foo')
+
+
 if __name__ == '__main__':
     unittest.main()